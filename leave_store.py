@@ -0,0 +1,101 @@
+from array import array
+from datetime import date, datetime
+
+import numpy as np
+
+
+# 휴가유형 코드와 코드별 차감 일수
+TYPE_CODES = {"연차": 0, "오전반차": 1, "오후반차": 2}
+TYPE_DAYS = np.array([1.0, 0.5, 0.5])
+
+
+def month_bounds(year, month):
+    """
+    해당 월의 첫날과 다음 달 첫날 (12월이면 다음 해 1월 1일)
+    """
+    return date(year, month, 1), date(year + month // 12, month % 12 + 1, 1)
+
+
+class LeaveStore:
+    """
+    휴가 기록을 열(column) 단위 NumPy 배열로 보관하는 저장소
+
+    레코드 하나는 사람 ID(uint32), 날짜 서수(int32), 휴가유형 코드(uint8)로
+    9바이트만 차지하므로 수백 명의 1년치 데이터도 수백 KB 안에 들어갑니다.
+    """
+
+    def __init__(self, names, person_ids, date_ordinals, type_codes):
+        self.names = names
+        self.person_ids = person_ids
+        self.date_ordinals = date_ordinals
+        self.type_codes = type_codes
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        (이름, ISO 날짜 문자열, 휴가유형) 레코드들로 저장소를 생성
+        (이름/날짜가 없거나 알 수 없는 휴가유형인 레코드는 건너뜁니다)
+        """
+        names = []
+        name_index = {}
+        # 적재 중에는 typed array에 쌓아 두고 마지막에 NumPy 배열로 변환
+        person_ids = array("I")
+        date_ordinals = array("i")
+        type_codes = array("B")
+        for name, date_str, vacation_type in records:
+            if not name or not date_str or vacation_type not in TYPE_CODES:
+                continue
+            person_id = name_index.get(name)
+            if person_id is None:
+                person_id = len(names)
+                name_index[name] = person_id
+                names.append(name)
+            person_ids.append(person_id)
+            date_ordinals.append(datetime.strptime(date_str[:10], "%Y-%m-%d").toordinal())
+            type_codes.append(TYPE_CODES[vacation_type])
+        return cls(
+            names,
+            np.array(person_ids, dtype=np.uint32),
+            np.array(date_ordinals, dtype=np.int32),
+            np.array(type_codes, dtype=np.uint8)
+        )
+
+    def __len__(self):
+        return len(self.person_ids)
+
+    def nbytes(self):
+        """
+        세 배열이 차지하는 바이트 수
+        """
+        return self.person_ids.nbytes + self.date_ordinals.nbytes + self.type_codes.nbytes
+
+    def _month_mask(self, year, month):
+        first, next_first = month_bounds(year, month)
+        start, end = first.toordinal(), next_first.toordinal()
+        return start, end, (self.date_ordinals >= start) & (self.date_ordinals < end)
+
+    def monthly_totals(self, year, month):
+        """
+        해당 월의 사람별 휴가 사용 일수 (반차는 0.5일)
+        """
+        _, _, mask = self._month_mask(year, month)
+        totals = np.bincount(
+            self.person_ids[mask],
+            weights=TYPE_DAYS[self.type_codes[mask]],
+            minlength=len(self.names)
+        )
+        return {self.names[i]: float(totals[i]) for i in np.flatnonzero(totals)}
+
+    def daily_headcount(self, year, month):
+        """
+        해당 월의 날짜별 휴무 인원 수 (같은 날 오전/오후 반차를 모두 쓴 사람은 한 명으로 계산)
+        """
+        start, end, mask = self._month_mask(year, month)
+        people = max(len(self.names), 1)
+        # (날짜, 사람) 쌍을 하나의 정수 키로 만들어 중복 제거
+        keys = np.unique((self.date_ordinals[mask].astype(np.int64) - start) * people + self.person_ids[mask])
+        counts = np.bincount(keys // people, minlength=end - start)
+        return {
+            date.fromordinal(start + int(offset)).strftime("%Y-%m-%d"): int(counts[offset])
+            for offset in np.flatnonzero(counts)
+        }
@@ -0,0 +1,46 @@
+import os
+import re
+from collections import Counter
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 쉼표로 구분된 허용 채널/봇 목록 (봇 목록이 비어 있으면 모든 봇 메시지 허용 - Flex 알림도 봇 메시지)
+SLACK_ALLOWED_CHANNELS = {c.strip() for c in os.getenv("SLACK_ALLOWED_CHANNELS", os.getenv("SLACK_CHANNEL_ID") or "").split(",") if c.strip()}
+SLACK_ALLOWED_BOT_IDS = {b.strip() for b in os.getenv("SLACK_ALLOWED_BOT_IDS", "").split(",") if b.strip()}
+
+# 휴가 메시지와 무관한 Slack 메시지 subtype
+IGNORED_SUBTYPES = {
+    "channel_join", "channel_leave", "channel_topic", "channel_purpose", "channel_name",
+    "channel_archive", "channel_unarchive", "group_join", "group_leave",
+    "message_changed", "message_deleted", "message_replied", "pinned_item", "unpinned_item"
+}
+# 휴가 신청/취소 템플릿에 반드시 들어가는 키워드 (반차 템플릿은 '오전/오후'만 포함)
+VACATION_KEYWORD_PATTERN = re.compile("휴가|반차|연차|취소|오전|오후")
+# 사전 필터에서 걸러진 메시지/줄 수 (사유별)
+PREFILTER_STATS = Counter()
+
+
+def prefilter_message(msg, check_channel=True, check_keyword=True):
+    """
+    정규식 파싱 전에 휴가와 무관한 메시지를 빠르게 걸러냄
+    (통과하면 True, 걸러지면 사유별로 PREFILTER_STATS에 기록하고 False)
+
+    채널 허용 목록은 여러 채널에서 들어오는 Events API 경로에서만 의미가 있고,
+    키워드 검사는 줄 단위로 다시 검사하는 호출자라면 check_keyword=False로 생략합니다.
+    """
+    if check_channel and SLACK_ALLOWED_CHANNELS and msg.get("channel") not in SLACK_ALLOWED_CHANNELS:
+        reason = "channel"
+    elif msg.get("subtype") in IGNORED_SUBTYPES:
+        reason = "subtype"
+    elif msg.get("bot_id") and SLACK_ALLOWED_BOT_IDS and msg["bot_id"] not in SLACK_ALLOWED_BOT_IDS:
+        reason = "bot"
+    elif msg.get("thread_ts") and msg.get("thread_ts") != msg.get("ts"):
+        reason = "thread_reply"
+    elif check_keyword and not VACATION_KEYWORD_PATTERN.search(msg.get("text", "")):
+        reason = "no_keyword"
+    else:
+        PREFILTER_STATS["passed"] += 1
+        return True
+    PREFILTER_STATS[reason] += 1
+    return False
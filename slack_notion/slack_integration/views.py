@@ -9,6 +9,7 @@ from slack_sdk.errors import SlackApiError
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from datetime import datetime, timedelta
+from prefilter import PREFILTER_STATS, prefilter_message
 
 load_dotenv()
 
@@ -17,6 +18,8 @@ SLACK_TOKEN = os.getenv("SLACK_TOKEN")
 NOTION_TOKEN = os.getenv("NOTION_TOKEN")
 NOTION_DATABASE_ID = os.getenv("NOTION_DATABASE_ID")
 SLACK_SIGNING_SECRET = os.getenv("SLACK_SIGNING_SECRET")
+# 사전 필터 통계를 출력할 이벤트 간격 (워커 프로세스별 누적값)
+PREFILTER_LOG_INTERVAL = 100
 
 # SSL 컨텍스트 설정
 ssl_context = ssl.create_default_context(cafile=certifi.where())
@@ -151,7 +154,9 @@ def slack_events(request):
         event_data = request.json()
         if "event" in event_data:
             event = event_data["event"]
-            if event.get("type") == "message" and "text" in event:
+            if event.get("type") != "message" or "text" not in event:
+                PREFILTER_STATS["not_message"] += 1
+            elif prefilter_message(event):
                 text = event["text"]
                 vacation_info = parse_message(text)
                 if vacation_info:
@@ -159,4 +164,6 @@ def slack_events(request):
                         delete_from_notion_calendar({"name": vacation_info["message"].split(" - ")[0]})
                     else:
                         add_to_notion_calendar(vacation_info)
+            if sum(PREFILTER_STATS.values()) % PREFILTER_LOG_INTERVAL == 0:
+                print(f"[사전 필터] (pid {os.getpid()}) {dict(PREFILTER_STATS)}")
         return JsonResponse({"status": "ok"})
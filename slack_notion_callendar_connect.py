@@ -1,5 +1,6 @@
 import os
 import re
+import sys
 import requests
 import ssl
 import certifi
@@ -7,6 +8,9 @@ from dotenv import load_dotenv
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 from datetime import datetime, timedelta
+from urllib.parse import unquote
+from leave_store import LeaveStore, month_bounds
+from prefilter import PREFILTER_STATS, VACATION_KEYWORD_PATTERN, prefilter_message
 
 
 # env 파일에서 환경 변수 로드
@@ -137,14 +141,99 @@ def parse_message(message):
 NOTION_URL = "https://api.notion.com/v1/pages"
 NOTION_SEARCH_URL = f"https://api.notion.com/v1/databases/{NOTION_DATABASE_ID}/query"
 
-def check_duplicate_date(vacation_date):
+NOTION_DATABASE_URL = f"https://api.notion.com/v1/databases/{NOTION_DATABASE_ID}"
+NOTION_PAGE_SIZE = 100
+
+# 데이터베이스 속성 이름 -> 속성 ID (최초 조회 시 한 번만 가져옴)
+_notion_property_ids = None
+
+
+class NotionQueryError(Exception):
+    """Notion 데이터베이스 쿼리가 도중에 실패했을 때 발생"""
+
+
+def get_notion_property_ids(names):
     """
-    Notion 데이터베이스에서 중복 날짜 확인
+    속성 이름 목록을 filter_properties에 넘길 속성 ID 목록으로 변환
+    (스키마 조회에 실패하거나 없는 이름이 있으면 None - 이 경우 모든 속성을 받습니다)
+    스키마는 성공/실패와 관계없이 실행당 한 번만 조회합니다.
+    """
+    global _notion_property_ids
+    if _notion_property_ids is None:
+        headers = {
+            "Authorization": f"Bearer {NOTION_TOKEN}",
+            "Notion-Version": "2021-08-16"
+        }
+        response = requests.get(NOTION_DATABASE_URL, headers=headers)
+        if response.status_code != 200:
+            print(f"Failed to fetch Notion database schema: {response.status_code}, {response.text}")
+            # 실패도 기억해 두어 이번 실행 동안은 다시 요청하지 않고 모든 속성을 받음
+            _notion_property_ids = {}
+            return None
+        # 속성 ID는 URL 인코딩된 상태로 내려오므로 디코딩해서 저장 (요청 시 requests가 다시 인코딩)
+        _notion_property_ids = {
+            name: unquote(prop["id"])
+            for name, prop in response.json().get("properties", {}).items()
+        }
+    if not all(name in _notion_property_ids for name in names):
+        return None
+    return [_notion_property_ids[name] for name in names]
+
+
+def _extract_property_value(prop):
+    """
+    Notion 속성 객체에서 비교에 필요한 값만 꺼내 단순 값으로 변환
+    """
+    prop_type = prop.get("type")
+    value = prop.get(prop_type)
+    if prop_type in ("title", "rich_text"):
+        return "".join(part.get("plain_text", "") for part in value or [])
+    if prop_type == "date":
+        return value.get("start") if value else None
+    if prop_type == "select":
+        return value.get("name") if value else None
+    return value
+
+
+def iter_notion_query(query, properties=None):
+    """
+    Notion 데이터베이스 쿼리 결과를 페이지 단위로 끝까지 순회하는 제너레이터
+
+    has_more/next_cursor를 따라 모든 결과를 page_size=100씩 가져오며,
+    properties로 지정한 속성만 요청해 {"id": ..., 속성명: 값} 형태의 가벼운 레코드를 yield 합니다.
+    한 번에 한 페이지(최대 100건)만 메모리에 유지합니다.
+    중간에 요청이 실패하면 결과가 잘리지 않도록 NotionQueryError를 발생시킵니다.
     """
     headers = {
         "Authorization": f"Bearer {NOTION_TOKEN}",
-        "Notion-Version": "2021-08-16"
+        "Notion-Version": "2021-08-16",
+        "Content-Type": "application/json"
     }
+    property_ids = get_notion_property_ids(properties) if properties else None
+    params = {"filter_properties": property_ids} if property_ids else None
+    cursor = None
+    while True:
+        body = dict(query, page_size=NOTION_PAGE_SIZE)
+        if cursor:
+            body["start_cursor"] = cursor
+        response = requests.post(NOTION_SEARCH_URL, headers=headers, params=params, json=body)
+        if response.status_code != 200:
+            raise NotionQueryError(f"{response.status_code}, {response.text}")
+        data = response.json()
+        for page in data.get("results", []):
+            record = {"id": page["id"]}
+            for name, prop in page.get("properties", {}).items():
+                record[name] = _extract_property_value(prop)
+            yield record
+        if not data.get("has_more") or not data.get("next_cursor"):
+            return
+        cursor = data["next_cursor"]
+
+
+def check_duplicate_date(vacation_date):
+    """
+    Notion 데이터베이스에서 중복 날짜 확인
+    """
     query = {
         "filter": {
             "property": "날짜",
@@ -153,13 +242,11 @@ def check_duplicate_date(vacation_date):
             }
         }
     }
-    response = requests.post(NOTION_SEARCH_URL, headers=headers, json=query)
-
-    if response.status_code == 200:
-        results = response.json().get("results", [])
-        return len(results) > 0
-    else:
-        print(f"Failed to check duplicates: {response.status_code}, {response.text}")
+    # 한 건이라도 있으면 중복이므로 첫 레코드에서 바로 중단
+    try:
+        return next(iter_notion_query(query, properties=["날짜"]), None) is not None
+    except NotionQueryError as e:
+        print(f"Failed to check duplicates: {e}")
         return False
 
 
@@ -271,51 +358,88 @@ def delete_from_notion_calendar(vacation_info):
             filters_with_date = filters.copy()
             filters_with_date.append({"property": "날짜", "date": {"equals": current.strftime("%Y-%m-%d")}})
             query = {"filter": {"and": filters_with_date}}
-            response = requests.post(NOTION_SEARCH_URL, headers=headers, json=query)
-            if response.status_code == 200:
-                results = response.json().get("results", [])
-                for page in results:
-                    page_id = page['id']
-                    patch_url = f"https://api.notion.com/v1/pages/{page_id}"
-                    patch_data = {"archived": True}
-                    patch_response = requests.patch(patch_url, headers=headers, json=patch_data)
-                    if patch_response.status_code == 200:
-                        print(f"{vacation_info['name']}의 {current.strftime('%Y-%m-%d')} 휴가가 삭제되었습니다.")
-                    else:
-                        print(f"Failed to archive in Notion: {patch_response.status_code}, {patch_response.text}")
-            else:
-                print(f"Failed to search for pages to delete: {response.status_code}, {response.text}")
+            # 보관(archive)하면 쿼리 결과에서 빠지므로 페이지 ID를 먼저 모두 모은 뒤 처리
+            try:
+                page_ids = [page['id'] for page in iter_notion_query(query, properties=["이름"])]
+            except NotionQueryError as e:
+                print(f"Failed to search for pages to delete ({current.strftime('%Y-%m-%d')}): {e}")
+                current += timedelta(days=1)
+                continue
+            for page_id in page_ids:
+                patch_url = f"https://api.notion.com/v1/pages/{page_id}"
+                patch_data = {"archived": True}
+                patch_response = requests.patch(patch_url, headers=headers, json=patch_data)
+                if patch_response.status_code == 200:
+                    print(f"{vacation_info['name']}의 {current.strftime('%Y-%m-%d')} 휴가가 삭제되었습니다.")
+                else:
+                    print(f"Failed to archive in Notion: {patch_response.status_code}, {patch_response.text}")
             current += timedelta(days=1)
         return
     
     # 단일 날짜
     query = {"filter": {"and": filters}}
-    response = requests.post(NOTION_SEARCH_URL, headers=headers, json=query)
-    if response.status_code == 200:
-        results = response.json().get("results", [])
-        for page in results:
-            page_id = page['id']
-            patch_url = f"https://api.notion.com/v1/pages/{page_id}"
-            patch_data = {"archived": True}
-            patch_response = requests.patch(patch_url, headers=headers, json=patch_data)
-            if patch_response.status_code == 200:
-                print(f"{vacation_info['name']}의 휴가가 삭제되었습니다.")
-            else:
-                print(f"Failed to archive in Notion: {patch_response.status_code}, {patch_response.text}")
-    else:
-        print(f"Failed to search for pages to delete: {response.status_code}, {response.text}")
+    try:
+        page_ids = [page['id'] for page in iter_notion_query(query, properties=["이름"])]
+    except NotionQueryError as e:
+        print(f"Failed to search for pages to delete: {e}")
+        return
+    for page_id in page_ids:
+        patch_url = f"https://api.notion.com/v1/pages/{page_id}"
+        patch_data = {"archived": True}
+        patch_response = requests.patch(patch_url, headers=headers, json=patch_data)
+        if patch_response.status_code == 200:
+            print(f"{vacation_info['name']}의 휴가가 삭제되었습니다.")
+        else:
+            print(f"Failed to archive in Notion: {patch_response.status_code}, {patch_response.text}")
+
+def build_leave_store(year, month):
+    """
+    Notion 데이터베이스에서 해당 월의 휴가 기록만 가져와 LeaveStore로 적재
+    """
+    first, next_first = month_bounds(year, month)
+    query = {"filter": {"and": [
+        {"property": "날짜", "date": {"on_or_after": first.strftime("%Y-%m-%d")}},
+        {"property": "날짜", "date": {"before": next_first.strftime("%Y-%m-%d")}}
+    ]}}
+    records = iter_notion_query(query, properties=["이름", "날짜", "휴가유형"])
+    return LeaveStore.from_records(
+        (record.get("이름"), record.get("날짜"), record.get("휴가유형")) for record in records
+    )
+
+
+def report(year, month):
+    """월별 리포트: 사람별 휴가 사용 일수와 날짜별 휴무 인원을 출력합니다."""
+    try:
+        store = build_leave_store(year, month)
+    except NotionQueryError as e:
+        print(f"Failed to load leave records: {e}")
+        return
+    print(f"[{year}-{month:02d} 리포트] 레코드 {len(store)}건, {store.nbytes()} bytes")
+    print("사람별 휴가 사용 일수")
+    for name, days in sorted(store.monthly_totals(year, month).items()):
+        print(f"  {name}: {days:g}일")
+    print("날짜별 휴무 인원")
+    for day, count in store.daily_headcount(year, month).items():
+        print(f"  {day}: {count}명")
+
 
 def main():
     """메인 함수: Slack 메시지를 가져와서 Notion에 추가/삭제합니다."""
     messages = get_recent_messages()
     # 오래된 메시지부터 처리
     for msg in reversed(messages):
+        # 조회 채널이 고정이고 키워드는 아래에서 줄 단위로 검사하므로 두 단계는 생략
+        if not prefilter_message(msg, check_channel=False, check_keyword=False):
+            continue
         text = msg.get("text", "")
         # 여러 줄이 들어올 경우 한 줄씩 처리
         for line in text.split('\n'):
             line = line.strip()
             if not line:
                 continue
+            if not VACATION_KEYWORD_PATTERN.search(line):
+                PREFILTER_STATS["no_keyword_line"] += 1
+                continue
             vacation_info = parse_message(line)
             if vacation_info:
                 if "date_range" in vacation_info:
@@ -329,6 +453,17 @@ def main():
                         add_to_notion_calendar(vacation_info)
                     else:
                         print(f"{vacation_info['name']}의 {vacation_info['date']}에 대한 중복 데이터가 있습니다.")
+    print(f"[사전 필터] {dict(PREFILTER_STATS)}")
 
 if __name__ == "__main__":
-    main()
+    # python slack_notion_callendar_connect.py report 2025-05
+    if len(sys.argv) >= 2 and sys.argv[1] == "report":
+        try:
+            target = datetime.strptime(sys.argv[2], "%Y-%m") if len(sys.argv) >= 3 else datetime.now()
+        except ValueError:
+            print(f"잘못된 월 형식입니다: {sys.argv[2]}")
+            print("사용법: python slack_notion_callendar_connect.py report YYYY-MM")
+            sys.exit(1)
+        report(target.year, target.month)
+    else:
+        main()
@@ -0,0 +1,61 @@
+import unittest
+from datetime import date
+
+from leave_store import LeaveStore, month_bounds
+
+
+class MonthBoundsTests(unittest.TestCase):
+    def test_regular_month(self):
+        self.assertEqual(month_bounds(2025, 5), (date(2025, 5, 1), date(2025, 6, 1)))
+
+    def test_december_rolls_over_to_next_year(self):
+        self.assertEqual(month_bounds(2025, 12), (date(2025, 12, 1), date(2026, 1, 1)))
+
+
+class LeaveStoreTests(unittest.TestCase):
+    def test_half_days_weigh_half(self):
+        store = LeaveStore.from_records([
+            ("홍길동", "2025-05-10", "연차"),
+            ("홍길동", "2025-05-12", "오전반차"),
+            ("김철수", "2025-05-13", "오후반차"),
+        ])
+        self.assertEqual(store.monthly_totals(2025, 5), {"홍길동": 1.5, "김철수": 0.5})
+
+    def test_records_outside_month_are_excluded(self):
+        store = LeaveStore.from_records([
+            ("홍길동", "2025-11-30", "연차"),
+            ("홍길동", "2025-12-31", "연차"),
+            ("홍길동", "2026-01-01", "연차"),
+        ])
+        self.assertEqual(store.monthly_totals(2025, 12), {"홍길동": 1.0})
+        self.assertEqual(store.daily_headcount(2025, 12), {"2025-12-31": 1})
+
+    def test_unknown_type_and_missing_fields_are_skipped(self):
+        store = LeaveStore.from_records([
+            ("홍길동", "2025-05-10", "병가"),
+            ("홍길동", None, "연차"),
+            (None, "2025-05-10", "연차"),
+            ("김철수", "2025-05-10T09:00:00.000+09:00", "연차"),
+        ])
+        self.assertEqual(len(store), 1)
+        self.assertEqual(store.names, ["김철수"])
+        self.assertEqual(store.nbytes(), 9)
+
+    def test_morning_and_afternoon_half_days_count_as_one_person(self):
+        store = LeaveStore.from_records([
+            ("홍길동", "2025-05-10", "오전반차"),
+            ("홍길동", "2025-05-10", "오후반차"),
+            ("김철수", "2025-05-10", "연차"),
+            ("김철수", "2025-05-11", "연차"),
+        ])
+        self.assertEqual(store.daily_headcount(2025, 5), {"2025-05-10": 2, "2025-05-11": 1})
+        self.assertEqual(store.monthly_totals(2025, 5), {"홍길동": 1.0, "김철수": 2.0})
+
+    def test_empty_store(self):
+        store = LeaveStore.from_records([])
+        self.assertEqual(store.monthly_totals(2025, 5), {})
+        self.assertEqual(store.daily_headcount(2025, 5), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
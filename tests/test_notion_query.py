@@ -0,0 +1,87 @@
+import unittest
+from unittest import mock
+
+import slack_notion_callendar_connect as connect
+
+
+def _response(status_code=200, payload=None):
+    response = mock.Mock(status_code=status_code, text="error")
+    response.json.return_value = payload or {}
+    return response
+
+
+def _page(page_id, name):
+    return {
+        "id": page_id,
+        "properties": {
+            "이름": {"id": "%3AUPp", "type": "rich_text", "rich_text": [{"plain_text": name}]}
+        }
+    }
+
+
+class IterNotionQueryTests(unittest.TestCase):
+    def setUp(self):
+        connect._notion_property_ids = None
+
+    def test_follows_cursor_until_has_more_is_false(self):
+        pages = [
+            _response(payload={"results": [_page("a", "홍길동")], "has_more": True, "next_cursor": "c1"}),
+            _response(payload={"results": [_page("b", "김철수")], "has_more": False, "next_cursor": None}),
+        ]
+        with mock.patch.object(connect.requests, "post", side_effect=pages) as post:
+            records = list(connect.iter_notion_query({"filter": {"property": "이름"}}))
+
+        self.assertEqual(records, [{"id": "a", "이름": "홍길동"}, {"id": "b", "이름": "김철수"}])
+        self.assertEqual(post.call_count, 2)
+        first_body = post.call_args_list[0].kwargs["json"]
+        second_body = post.call_args_list[1].kwargs["json"]
+        self.assertEqual(first_body["page_size"], 100)
+        self.assertNotIn("start_cursor", first_body)
+        self.assertEqual(second_body["start_cursor"], "c1")
+        self.assertEqual(second_body["filter"], {"property": "이름"})
+
+    def test_projects_properties_by_id(self):
+        schema = _response(payload={"properties": {"이름": {"id": "%3AUPp"}, "날짜": {"id": "title"}}})
+        result = _response(payload={"results": [], "has_more": False})
+        with mock.patch.object(connect.requests, "get", return_value=schema) as get, \
+                mock.patch.object(connect.requests, "post", return_value=result) as post:
+            list(connect.iter_notion_query({}, properties=["이름"]))
+            list(connect.iter_notion_query({}, properties=["날짜"]))
+
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(post.call_args_list[0].kwargs["params"], {"filter_properties": [":UPp"]})
+        self.assertEqual(post.call_args_list[1].kwargs["params"], {"filter_properties": ["title"]})
+
+    def test_unknown_property_name_disables_projection(self):
+        schema = _response(payload={"properties": {"이름": {"id": "abc"}}})
+        result = _response(payload={"results": [], "has_more": False})
+        with mock.patch.object(connect.requests, "get", return_value=schema), \
+                mock.patch.object(connect.requests, "post", return_value=result) as post:
+            list(connect.iter_notion_query({}, properties=["없는속성"]))
+
+        self.assertIsNone(post.call_args.kwargs["params"])
+
+    def test_failed_schema_fetch_is_not_retried(self):
+        result = _response(payload={"results": [], "has_more": False})
+        with mock.patch.object(connect.requests, "get", return_value=_response(status_code=500)) as get, \
+                mock.patch.object(connect.requests, "post", return_value=result) as post:
+            list(connect.iter_notion_query({}, properties=["이름"]))
+            list(connect.iter_notion_query({}, properties=["날짜"]))
+
+        self.assertEqual(get.call_count, 1)
+        self.assertIsNone(post.call_args.kwargs["params"])
+
+    def test_failed_later_page_raises(self):
+        pages = [
+            _response(payload={"results": [_page("a", "홍길동")], "has_more": True, "next_cursor": "c1"}),
+            _response(status_code=500),
+        ]
+        with mock.patch.object(connect.requests, "post", side_effect=pages):
+            records = connect.iter_notion_query({})
+            self.assertEqual(next(records)["id"], "a")
+            with self.assertRaises(connect.NotionQueryError):
+                next(records)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from unittest import mock
+
+import prefilter
+
+
+class PrefilterMessageTests(unittest.TestCase):
+    def setUp(self):
+        prefilter.PREFILTER_STATS.clear()
+        patcher = mock.patch.multiple(prefilter, SLACK_ALLOWED_CHANNELS={"C1"}, SLACK_ALLOWED_BOT_IDS=set())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_vacation_message_passes(self):
+        self.assertTrue(prefilter.prefilter_message({"channel": "C1", "text": "홍길동 - 5월 10일 오전"}))
+        self.assertEqual(prefilter.PREFILTER_STATS, {"passed": 1})
+
+    def test_rejections_are_counted_by_reason(self):
+        messages = [
+            {"channel": "C2", "text": "홍길동 - 5월 10일 하루종일 휴가입니다."},
+            {"channel": "C1", "subtype": "channel_join", "text": "휴가"},
+            {"channel": "C1", "text": "휴가", "thread_ts": "1.0", "ts": "2.0"},
+            {"channel": "C1", "text": "점심 뭐 먹지"},
+        ]
+        self.assertFalse(any(prefilter.prefilter_message(msg) for msg in messages))
+        self.assertEqual(
+            prefilter.PREFILTER_STATS,
+            {"channel": 1, "subtype": 1, "thread_reply": 1, "no_keyword": 1}
+        )
+
+    def test_bots_filtered_only_when_allowlist_is_set(self):
+        msg = {"channel": "C1", "bot_id": "B1", "text": "휴가"}
+        self.assertTrue(prefilter.prefilter_message(msg))
+        with mock.patch.object(prefilter, "SLACK_ALLOWED_BOT_IDS", {"B2"}):
+            self.assertFalse(prefilter.prefilter_message(msg))
+        self.assertEqual(prefilter.PREFILTER_STATS["bot"], 1)
+
+    def test_polling_path_skips_channel_and_keyword_checks(self):
+        msg = {"text": "점심 뭐 먹지"}
+        self.assertTrue(prefilter.prefilter_message(msg, check_channel=False, check_keyword=False))
+
+
+if __name__ == "__main__":
+    unittest.main()